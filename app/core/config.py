@@ -79,6 +79,10 @@ class Settings(BaseSettings):
         default=LogLevel.INFO, 
         description="Logging level"
     )
+    BATCH_ERROR_LOGS: bool = Field(
+        default=False, 
+        description="Buffer error logs and flush them in batches from a background task"
+    )
     
     # External API Keys
     ANTHROPIC_API_KEY: str = Field(
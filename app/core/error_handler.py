@@ -5,22 +5,66 @@ This module provides comprehensive error handling with consistent error response
 specific error codes for different failure scenarios, and detailed logging capabilities.
 """
 
+import asyncio
+import contextlib
 import logging
+import re
 import time
+from collections import deque
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional, Tuple
+from typing import Callable, Deque, Dict, Any, Optional, Tuple, Union
 from enum import Enum
 
 from fastapi import Request, HTTPException
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
-from pydantic import ValidationError
+from pydantic import BaseModel, ValidationError
 from anthropic import APIError, RateLimitError, APITimeoutError
 
 from app.models.responses import ErrorResponse
 
 
+# Bound once at import so timestamping an error skips the global/attribute lookups
+_UTC = timezone.utc
+_now = datetime.now
+
+# Batched error logging: flush every interval, or early once a batch has built up
+_LOG_FLUSH_INTERVAL = 0.1
+_LOG_BATCH_SIZE = 64
+# Backpressure cap; past this many pending records log_error flushes inline
+_LOG_MAX_PENDING = 1024
+
+
+class ModelJSONResponse(JSONResponse):
+    """
+    JSONResponse that renders a Pydantic model with its own JSON serializer.
+    
+    The model is encoded straight to bytes by pydantic-core, skipping the
+    intermediate dict from model_dump() and the stdlib json.dumps pass.
+    Unset optional fields such as ``details`` are left out of the body.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content, exclude_none=True)
+        return super().render(content)
+
+
 class ErrorCode(str, Enum):
-    """Enumeration of error codes for different failure scenarios."""
+    """
+    Enumeration of error codes for different failure scenarios.
+    
+    Each member also carries ``ordinal``, its definition position, which
+    indexes the module's dense status and message tables.
+    """
+    
+    ordinal: int
+    
+    def __new__(cls, value: str) -> "ErrorCode":
+        member = str.__new__(cls, value)
+        member._value_ = value
+        member.ordinal = len(cls.__members__)
+        return member
     
     # HTTP status code specific errors
     HTTP_400 = "HTTP_400"
@@ -121,15 +165,27 @@ class ErrorHandler:
         ErrorCode.LLM_INVALID_RESPONSE: "LLM API returned invalid response",
     }
     
-    def __init__(self, logger: Optional[logging.Logger] = None):
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
         """
         Initialize the ErrorHandler.
         
         Args:
             logger: Optional logger instance. If not provided, creates a new logger.
+            clock: Monotonic clock used for request timing (default: time.monotonic)
         """
         self.logger = logger or logging.getLogger(__name__)
+        self._clock = clock
         self._request_start_times: Dict[str, float] = {}
+        
+        # Batched logging state, only used while the flusher task is running
+        self._pending_logs: Deque[logging.LogRecord] = deque()
+        self._flush_wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._flush_task: Optional[asyncio.Task] = None
     
     def start_request_timing(self, request_id: str) -> None:
         """
@@ -138,7 +194,7 @@ class ErrorHandler:
         Args:
             request_id: Unique identifier for the request
         """
-        self._request_start_times[request_id] = time.time()
+        self._request_start_times[request_id] = self._clock()
     
     def get_request_duration(self, request_id: str) -> Optional[float]:
         """
@@ -150,19 +206,30 @@ class ErrorHandler:
         Returns:
             Duration in seconds, or None if request timing wasn't started
         """
-        start_time = self._request_start_times.get(request_id)
-        if start_time:
-            duration = time.time() - start_time
-            # Clean up the stored start time
-            del self._request_start_times[request_id]
-            return duration
-        return None
+        # Pop so the stored start time is cleaned up
+        start_time = self._request_start_times.pop(request_id, None)
+        if start_time is None:
+            return None
+        return self._clock() - start_time
+    
+    def get_status_code(self, error_code: ErrorCode) -> int:
+        """
+        Get the HTTP status code for an error code.
+        
+        Args:
+            error_code: The error code enum value
+            
+        Returns:
+            HTTP status code, 500 for codes without an explicit mapping
+        """
+        return _STATUS_BY_ORDINAL[error_code.ordinal]
     
     def create_error_response(
         self,
         error_code: ErrorCode,
         message: Optional[str] = None,
-        details: Optional[Dict[str, Any]] = None
+        details: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[datetime] = None
     ) -> ErrorResponse:
         """
         Create a standardized error response.
@@ -171,19 +238,20 @@ class ErrorHandler:
             error_code: The error code enum value
             message: Optional custom error message. If not provided, uses default message.
             details: Optional additional error details
+            timestamp: Optional error time, shared with log_error() so one
+                error is stamped once; defaults to now
             
         Returns:
             ErrorResponse: Standardized error response object
         """
-        final_message = message or self.ERROR_MESSAGES.get(error_code, "Unknown error")
-        
-        if details:
-            final_message = f"{final_message}. Details: {details}"
-        
-        return ErrorResponse(
+        # Details stay structured and are serialized with the response, rather
+        # than being stringified into the message up front. Every field is
+        # built here from trusted values, so construct without re-validating.
+        return ErrorResponse.model_construct(
             error=error_code.value,
-            message=final_message,
-            timestamp=datetime.now(timezone.utc)
+            message=message or _MSG_BY_ORDINAL[error_code.ordinal],
+            timestamp=timestamp or _now(_UTC),
+            details=details or None
         )
     
     def log_error(
@@ -194,11 +262,16 @@ class ErrorHandler:
         exception: Optional[Exception] = None,
         request_id: Optional[str] = None,
         url: Optional[str] = None,
-        additional_context: Optional[Dict[str, Any]] = None
+        additional_context: Union[Dict[str, Any], Callable[[], Dict[str, Any]], None] = None,
+        timestamp: Optional[datetime] = None
     ) -> None:
         """
         Log error with comprehensive context information.
         
+        Context that is expensive to build can be passed as a zero-argument
+        callable returning the dict; it is only called if the record will
+        actually be logged.
+        
         Args:
             error_code: The error code enum value
             message: Error message
@@ -206,21 +279,39 @@ class ErrorHandler:
             exception: Optional exception that caused the error
             request_id: Optional unique request identifier
             url: Optional URL being processed
-            additional_context: Optional additional context information
+            additional_context: Optional additional context information, or a
+                callable producing it
+            timestamp: Optional error time, shared with create_error_response()
+                so one error is stamped once; defaults to now
         """
+        # Skip building context when the record would be dropped anyway, but
+        # still release any timing entry this request left behind
+        if not self.logger.isEnabledFor(logging.ERROR):
+            if request_id:
+                self._request_start_times.pop(request_id, None)
+            return
+        
+        code_str = error_code.value
+        
         # Build context information
         context = {
-            "error_code": error_code.value,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "error_code": code_str,
+            "timestamp": (timestamp or _now(_UTC)).isoformat(),
         }
         
+        # Bare errors carry nothing beyond the code and timestamp, so skip the
+        # enrichment checks entirely
+        if request is None and not request_id and not url and additional_context is None:
+            self._emit_error(f"{code_str}: {message}", context, exception)
+            return
+        
         if request:
-            context.update({
-                "method": request.method,
-                "url": str(request.url),
-                "client_ip": getattr(request.client, 'host', 'unknown') if request.client else 'unknown',
-                "user_agent": request.headers.get("user-agent", "unknown"),
-            })
+            # Assign keys directly rather than update() from a throwaway dict
+            client = request.client
+            context["method"] = request.method
+            context["url"] = str(request.url)
+            context["client_ip"] = getattr(client, 'host', 'unknown') if client else 'unknown'
+            context["user_agent"] = request.headers.get("user-agent", "unknown")
         
         if request_id:
             context["request_id"] = request_id
@@ -232,13 +323,39 @@ class ErrorHandler:
         if url:
             context["target_url"] = url
         
-        if additional_context:
-            context.update(additional_context)
+        if additional_context is not None:
+            if callable(additional_context):
+                additional_context = additional_context()
+            if additional_context:
+                context.update(additional_context)
         
         # Log the error with full context
-        log_message = f"{error_code.value}: {message}"
+        self._emit_error(f"{code_str}: {message}", context, exception)
+    
+    def _emit_error(
+        self,
+        log_message: str,
+        context: Dict[str, Any],
+        exception: Optional[Exception]
+    ) -> None:
+        """
+        Emit an ERROR record, or buffer it while the batch flusher is running.
         
-        if exception:
+        Args:
+            log_message: Formatted log message
+            context: Context dict attached to the record as ``context``
+            exception: Optional exception whose traceback is attached
+        """
+        if self._flush_task is not None:
+            exc_info = (type(exception), exception, exception.__traceback__) if exception else None
+            # Resolve the call site now, as logger.error would, so buffered
+            # records keep their pathname, lineno and funcName
+            fn, lno, func, sinfo = self.logger.findCaller()
+            self._enqueue_log(self.logger.makeRecord(
+                self.logger.name, logging.ERROR, fn, lno,
+                log_message, (), exc_info, func=func, extra={"context": context}, sinfo=sinfo
+            ))
+        elif exception:
             self.logger.error(
                 log_message,
                 extra={"context": context},
@@ -250,12 +367,86 @@ class ErrorHandler:
                 extra={"context": context}
             )
     
+    @property
+    def batching(self) -> bool:
+        """Whether error logs are currently buffered for the background flusher."""
+        return self._flush_task is not None
+    
+    def _enqueue_log(self, record: logging.LogRecord) -> None:
+        """
+        Buffer a log record for the background flusher.
+        
+        Args:
+            record: Prebuilt ERROR record to emit on the next flush
+        """
+        pending = self._pending_logs
+        pending.append(record)
+        if len(pending) >= _LOG_MAX_PENDING:
+            self.flush_logs()
+        elif len(pending) >= _LOG_BATCH_SIZE:
+            # Event.set() is not thread-safe and this can run off the loop thread
+            self._loop.call_soon_threadsafe(self._flush_wakeup.set)
+    
+    def flush_logs(self) -> int:
+        """
+        Emit all buffered error log records.
+        
+        Returns:
+            Number of records emitted
+        """
+        pending = self._pending_logs
+        handle = self.logger.handle
+        count = 0
+        while pending:
+            handle(pending.popleft())
+            count += 1
+        return count
+    
+    async def start_log_flusher(self) -> None:
+        """
+        Start buffering error logs and flushing them from a background task.
+        
+        Must be called from a running event loop; does nothing if the flusher
+        is already running.
+        """
+        if self._flush_task is not None:
+            return
+        self._flush_wakeup = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        self._flush_task = asyncio.create_task(self._flush_loop())
+    
+    async def stop_log_flusher(self) -> None:
+        """
+        Stop the background flusher and emit any records still buffered.
+        """
+        task = self._flush_task
+        if task is None:
+            return
+        # Clear first so log_error goes back to logging synchronously
+        self._flush_task = None
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        self.flush_logs()
+    
+    async def _flush_loop(self) -> None:
+        """
+        Flush buffered records every interval, or sooner once a batch is ready.
+        """
+        wakeup = self._flush_wakeup
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(wakeup.wait(), _LOG_FLUSH_INTERVAL)
+            wakeup.clear()
+            self.flush_logs()
+    
     def handle_anthropic_error(
         self,
         error: Exception,
         request: Optional[Request] = None,
         request_id: Optional[str] = None,
-        url: Optional[str] = None
+        url: Optional[str] = None,
+        timestamp: Optional[datetime] = None
     ) -> Tuple[ErrorCode, str]:
         """
         Handle Anthropic API specific errors and return appropriate error code and message.
@@ -265,40 +456,14 @@ class ErrorHandler:
             request: Optional FastAPI request object
             request_id: Optional unique request identifier
             url: Optional URL being processed
+            timestamp: Optional error time for the log record, so callers can
+                reuse it for the response; defaults to now
             
         Returns:
             Tuple of (ErrorCode, error_message)
         """
-        error_message = str(error)
-        
-        if isinstance(error, RateLimitError):
-            error_code = ErrorCode.LLM_RATE_LIMITED
-            message = f"Anthropic API rate limit exceeded: {error_message}"
-            
-            # Check if it's a quota exceeded error
-            if "quota" in error_message.lower() or "billing" in error_message.lower():
-                error_code = ErrorCode.LLM_QUOTA_EXCEEDED
-                message = f"Anthropic API quota exceeded: {error_message}"
-                
-        elif isinstance(error, APITimeoutError):
-            error_code = ErrorCode.LLM_TIMEOUT
-            message = f"Anthropic API timeout: {error_message}"
-            
-        elif isinstance(error, APIError):
-            error_code = ErrorCode.LLM_API_ERROR
-            message = f"Anthropic API error: {error_message}"
-            
-            # Check for specific API error types
-            if hasattr(error, 'status_code'):
-                if error.status_code == 429:
-                    error_code = ErrorCode.LLM_RATE_LIMITED
-                elif error.status_code >= 500:
-                    message = f"Anthropic API server error (HTTP {error.status_code}): {error_message}"
-                elif error.status_code >= 400:
-                    message = f"Anthropic API client error (HTTP {error.status_code}): {error_message}"
-        else:
-            error_code = ErrorCode.LLM_API_ERROR
-            message = f"Unknown Anthropic API error: {error_message}"
+        error_type = type(error)
+        error_code, message = _anthropic_handler_for(error, error_type)(error, str(error))
         
         # Log the error with context
         self.log_error(
@@ -308,7 +473,8 @@ class ErrorHandler:
             exception=error,
             request_id=request_id,
             url=url,
-            additional_context={"anthropic_error_type": type(error).__name__}
+            additional_context={"anthropic_error_type": error_type.__name__},
+            timestamp=timestamp
         )
         
         return error_code, message
@@ -318,7 +484,8 @@ class ErrorHandler:
         error: Exception,
         request: Optional[Request] = None,
         request_id: Optional[str] = None,
-        url: Optional[str] = None
+        url: Optional[str] = None,
+        timestamp: Optional[datetime] = None
     ) -> Tuple[ErrorCode, str]:
         """
         Handle parsing-related errors and return appropriate error code and message.
@@ -328,31 +495,20 @@ class ErrorHandler:
             request: Optional FastAPI request object
             request_id: Optional unique request identifier
             url: Optional URL being processed
+            timestamp: Optional error time for the log record, so callers can
+                reuse it for the response; defaults to now
             
         Returns:
             Tuple of (ErrorCode, error_message)
         """
-        error_message = str(error).lower()
+        error_message = str(error)
         
         if isinstance(error, ValueError):
-            if "invalid url" in error_message or "malformed url" in error_message:
-                error_code = ErrorCode.INVALID_URL
-                message = f"Invalid URL format: {str(error)}"
-            elif "not supported" in error_message or "unsupported platform" in error_message:
-                error_code = ErrorCode.UNSUPPORTED_PLATFORM
-                message = f"Platform not supported: {str(error)}"
-            elif "no meaningful text" in error_message or "parsing failed" in error_message:
-                error_code = ErrorCode.PARSING_FAILED
-                message = f"Failed to parse content: {str(error)}"
-            elif "missing data" in error_message or "required data not found" in error_message:
-                error_code = ErrorCode.MISSING_DATA
-                message = f"Required data missing: {str(error)}"
-            else:
-                error_code = ErrorCode.PARSING_FAILED
-                message = f"Parsing error: {str(error)}"
+            match = _PARSING_RE.match(error_message)
+            error_code, prefix = _PARSING_DISPATCH[match.lastgroup] if match else (ErrorCode.PARSING_FAILED, "Parsing error")
         else:
-            error_code = ErrorCode.PARSING_FAILED
-            message = f"Unexpected parsing error: {str(error)}"
+            error_code, prefix = ErrorCode.PARSING_FAILED, "Unexpected parsing error"
+        message = f"{prefix}: {error_message}"
         
         # Log the error with context
         self.log_error(
@@ -362,7 +518,8 @@ class ErrorHandler:
             exception=error,
             request_id=request_id,
             url=url,
-            additional_context={"parsing_error_type": type(error).__name__}
+            additional_context={"parsing_error_type": type(error).__name__},
+            timestamp=timestamp
         )
         
         return error_code, message
@@ -372,7 +529,8 @@ class ErrorHandler:
         error: Exception,
         request: Optional[Request] = None,
         request_id: Optional[str] = None,
-        url: Optional[str] = None
+        url: Optional[str] = None,
+        timestamp: Optional[datetime] = None
     ) -> Tuple[ErrorCode, str]:
         """
         Handle HTTP-related errors and return appropriate error code and message.
@@ -382,30 +540,17 @@ class ErrorHandler:
             request: Optional FastAPI request object
             request_id: Optional unique request identifier
             url: Optional URL being processed
+            timestamp: Optional error time for the log record, so callers can
+                reuse it for the response; defaults to now
             
         Returns:
             Tuple of (ErrorCode, error_message)
         """
-        error_message = str(error).lower()
-        
-        if "connection" in error_message or "network" in error_message:
-            error_code = ErrorCode.URL_UNREACHABLE
-            message = f"Network connection error: {str(error)}"
-        elif "404" in error_message or "not found" in error_message:
-            error_code = ErrorCode.URL_UNREACHABLE
-            message = f"URL not found (404): {str(error)}"
-        elif "403" in error_message or "forbidden" in error_message:
-            error_code = ErrorCode.URL_UNREACHABLE
-            message = f"Access forbidden (403): {str(error)}"
-        elif "429" in error_message or "rate limit" in error_message:
-            error_code = ErrorCode.RATE_LIMITED
-            message = f"Rate limit exceeded: {str(error)}"
-        elif "timeout" in error_message:
-            error_code = ErrorCode.TIMEOUT
-            message = f"Request timeout: {str(error)}"
-        else:
-            error_code = ErrorCode.URL_UNREACHABLE
-            message = f"HTTP error: {str(error)}"
+        error_message = str(error)
+        
+        match = _HTTP_RE.match(error_message)
+        error_code, prefix = _HTTP_DISPATCH[match.lastgroup] if match else (ErrorCode.URL_UNREACHABLE, "HTTP error")
+        message = f"{prefix}: {error_message}"
         
         # Log the error with context
         self.log_error(
@@ -415,7 +560,8 @@ class ErrorHandler:
             exception=error,
             request_id=request_id,
             url=url,
-            additional_context={"http_error_type": type(error).__name__}
+            additional_context={"http_error_type": type(error).__name__},
+            timestamp=timestamp
         )
         
         return error_code, message
@@ -424,7 +570,8 @@ class ErrorHandler:
         self,
         error_code: ErrorCode,
         message: Optional[str] = None,
-        details: Optional[Dict[str, Any]] = None
+        details: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[datetime] = None
     ) -> JSONResponse:
         """
         Create a JSON response for an error.
@@ -433,16 +580,17 @@ class ErrorHandler:
             error_code: The error code enum value
             message: Optional custom error message
             details: Optional additional error details
+            timestamp: Optional error time; defaults to now
             
         Returns:
             JSONResponse: FastAPI JSON response with appropriate status code
         """
-        error_response = self.create_error_response(error_code, message, details)
-        status_code = self.ERROR_STATUS_MAPPING.get(error_code, 500)
+        error_response = self.create_error_response(error_code, message, details, timestamp)
+        status_code = _STATUS_BY_ORDINAL[error_code.ordinal]
         
-        return JSONResponse(
+        return ModelJSONResponse(
             status_code=status_code,
-            content=error_response.model_dump(mode='json')
+            content=error_response
         )
     
     def handle_validation_error(
@@ -462,8 +610,12 @@ class ErrorHandler:
         Returns:
             JSONResponse: Error response for validation failure
         """
-        error_details = error.errors()
+        # Error contexts can hold arbitrary objects (e.g. the exception a
+        # validator raised), so encode them once before they reach either the
+        # JSON log context or the response
+        error_details = jsonable_encoder(error.errors())
         message = f"Validation failed: {error_details}"
+        now = _now(_UTC)
         
         self.log_error(
             error_code=ErrorCode.VALIDATION_ERROR,
@@ -471,15 +623,135 @@ class ErrorHandler:
             request=request,
             exception=error,
             request_id=request_id,
-            additional_context={"validation_errors": error_details}
+            additional_context={"validation_errors": error_details},
+            timestamp=now
         )
         
         return self.create_json_response(
             ErrorCode.VALIDATION_ERROR,
             message,
-            {"validation_errors": error_details}
+            {"validation_errors": error_details},
+            now
         )
 
 
+# Dense views of the class mappings indexed by ErrorCode.ordinal, with the
+# defaults filled in for every code. Hot paths index a tuple instead of
+# hashing the enum member, whose __hash__ is a Python-level call.
+_STATUS_BY_ORDINAL: Tuple[int, ...] = tuple(
+    ErrorHandler.ERROR_STATUS_MAPPING.get(code, 500) for code in ErrorCode
+)
+_MSG_BY_ORDINAL: Tuple[str, ...] = tuple(
+    ErrorHandler.ERROR_MESSAGES.get(code, "Unknown error") for code in ErrorCode
+)
+
+
+def _compile_classifier(rules: Tuple[Tuple[str, Tuple[str, ...], ErrorCode, str], ...]) -> Tuple["re.Pattern[str]", Dict[str, Tuple[ErrorCode, str]]]:
+    """
+    Compile ordered substring rules into one case-insensitive regex.
+    
+    Each rule becomes a lookahead anchored at the start of the message, so the
+    first rule with a substring anywhere in the message wins, exactly like an
+    if/elif chain, and match.lastgroup names that rule.
+    
+    Args:
+        rules: Ordered (name, substrings, error_code, message_prefix) tuples
+        
+    Returns:
+        Tuple of (compiled pattern, {rule name: (error_code, message_prefix)})
+    """
+    pattern = "|".join(
+        f"(?=.*?(?:{'|'.join(map(re.escape, substrings))}))(?P<{name}>)"
+        for name, substrings, _, _ in rules
+    )
+    dispatch = {name: (error_code, prefix) for name, _, error_code, prefix in rules}
+    return re.compile(pattern, re.IGNORECASE | re.DOTALL), dispatch
+
+
+def _anthropic_rate_limit(error: RateLimitError, error_message: str) -> Tuple[ErrorCode, str]:
+    """Classify an Anthropic rate limit error, separating quota exhaustion."""
+    lowered = error_message.lower()
+    if "quota" in lowered or "billing" in lowered:
+        return ErrorCode.LLM_QUOTA_EXCEEDED, f"Anthropic API quota exceeded: {error_message}"
+    return ErrorCode.LLM_RATE_LIMITED, f"Anthropic API rate limit exceeded: {error_message}"
+
+
+def _anthropic_timeout(error: APITimeoutError, error_message: str) -> Tuple[ErrorCode, str]:
+    """Classify an Anthropic timeout error."""
+    return ErrorCode.LLM_TIMEOUT, f"Anthropic API timeout: {error_message}"
+
+
+def _anthropic_api_error(error: APIError, error_message: str) -> Tuple[ErrorCode, str]:
+    """Classify a generic Anthropic API error by its HTTP status, if any."""
+    status_code = getattr(error, 'status_code', None)
+    if status_code is None:
+        return ErrorCode.LLM_API_ERROR, f"Anthropic API error: {error_message}"
+    if status_code == 429:
+        return ErrorCode.LLM_RATE_LIMITED, f"Anthropic API error: {error_message}"
+    if status_code >= 500:
+        return ErrorCode.LLM_API_ERROR, f"Anthropic API server error (HTTP {status_code}): {error_message}"
+    if status_code >= 400:
+        return ErrorCode.LLM_API_ERROR, f"Anthropic API client error (HTTP {status_code}): {error_message}"
+    return ErrorCode.LLM_API_ERROR, f"Anthropic API error: {error_message}"
+
+
+def _anthropic_unknown(error: Exception, error_message: str) -> Tuple[ErrorCode, str]:
+    """Classify an error that is not an Anthropic API error type."""
+    return ErrorCode.LLM_API_ERROR, f"Unknown Anthropic API error: {error_message}"
+
+
+# Most specific first: RateLimitError and APITimeoutError both subclass APIError
+_ANTHROPIC_HANDLERS = (
+    (RateLimitError, _anthropic_rate_limit),
+    (APITimeoutError, _anthropic_timeout),
+    (APIError, _anthropic_api_error),
+)
+# Exact-type lookup table, filled in lazily for subclasses and unrelated types
+_ANTHROPIC_DISPATCH: Dict[type, Callable[[Any, str], Tuple[ErrorCode, str]]] = dict(_ANTHROPIC_HANDLERS)
+
+
+def _anthropic_handler_for(error: Exception, error_type: type) -> Callable[[Any, str], Tuple[ErrorCode, str]]:
+    """
+    Look up the classifier for an Anthropic error by its exact type.
+    
+    Types not yet in the table are resolved with an isinstance scan and
+    cached, unless the instance reports a different __class__ (e.g. a spec'd
+    mock), since isinstance then depends on the instance rather than its type.
+    
+    Args:
+        error: The error being handled
+        error_type: type(error), already computed by the caller
+        
+    Returns:
+        Classifier returning (ErrorCode, error_message)
+    """
+    handler = _ANTHROPIC_DISPATCH.get(error_type)
+    if handler is None:
+        handler = next(
+            (candidate for base, candidate in _ANTHROPIC_HANDLERS if isinstance(error, base)),
+            _anthropic_unknown
+        )
+        if error.__class__ is error_type:
+            _ANTHROPIC_DISPATCH[error_type] = handler
+    return handler
+
+
+# Message classifiers for handle_http_error() and handle_parsing_error(), in priority order
+_HTTP_RE, _HTTP_DISPATCH = _compile_classifier((
+    ("net", ("connection", "network"), ErrorCode.URL_UNREACHABLE, "Network connection error"),
+    ("nf", ("404", "not found"), ErrorCode.URL_UNREACHABLE, "URL not found (404)"),
+    ("fb", ("403", "forbidden"), ErrorCode.URL_UNREACHABLE, "Access forbidden (403)"),
+    ("rl", ("429", "rate limit"), ErrorCode.RATE_LIMITED, "Rate limit exceeded"),
+    ("to", ("timeout",), ErrorCode.TIMEOUT, "Request timeout"),
+    ("llm", ("anthropic",), ErrorCode.LLM_API_ERROR, "LLM API error"),
+))
+_PARSING_RE, _PARSING_DISPATCH = _compile_classifier((
+    ("url", ("invalid url", "malformed url"), ErrorCode.INVALID_URL, "Invalid URL format"),
+    ("platform", ("not supported", "unsupported platform"), ErrorCode.UNSUPPORTED_PLATFORM, "Platform not supported"),
+    ("parse", ("no meaningful text", "parsing failed"), ErrorCode.PARSING_FAILED, "Failed to parse content"),
+    ("missing", ("missing data", "required data not found"), ErrorCode.MISSING_DATA, "Required data missing"),
+))
+
+
 # Global error handler instance
 error_handler = ErrorHandler()
\ No newline at end of file
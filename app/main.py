@@ -5,17 +5,17 @@ Travel Data Parser API - FastAPI Application
 import asyncio
 import logging
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from fastapi import FastAPI, Request, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from pydantic import ValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from anthropic import APIError, RateLimitError, APITimeoutError
 
 from app.core.config import get_global_settings
-from app.core.error_handler import error_handler, ErrorCode
+from app.core.error_handler import error_handler, ErrorCode, ModelJSONResponse
 from app.models.requests import FlightParseRequest, LodgingParseRequest
 from app.models.responses import ErrorResponse, FlightParseResponse, LodgingParseResponse
 from app.services.universal_parser import UniversalParser
@@ -49,11 +49,24 @@ for handler in logging.root.handlers:
 
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the batched error log flusher for the lifetime of the app, if enabled."""
+    if settings.BATCH_ERROR_LOGS:
+        await error_handler.start_log_flusher()
+    try:
+        yield
+    finally:
+        # Flush anything still buffered before shutting down
+        await error_handler.stop_log_flusher()
+
+
 # Create FastAPI application instance
 app = FastAPI(
     title="Travel Data Parser API",
     version="1.0.0",
-    description="API for parsing travel booking data from various platforms"
+    description="API for parsing travel booking data from various platforms",
+    lifespan=lifespan
 )
 
 # Configure CORS middleware
@@ -73,6 +86,11 @@ cache_manager = CacheManager(
     max_size=settings.CACHE_MAX_SIZE
 )
 
+# Error statuses the parse endpoints document; every one carries an ErrorResponse body
+PARSE_ERROR_RESPONSES = {
+    status_code: {"model": ErrorResponse} for status_code in (400, 422, 429, 500)
+}
+
 # Dependency injection for UniversalParser
 async def get_universal_parser() -> UniversalParser:
     """Dependency to provide UniversalParser instance."""
@@ -108,19 +126,22 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     else:
         error_code = ErrorCode.HTTP_500
     
+    # One timestamp for both the log record and the response
+    now = datetime.now(timezone.utc)
     error_handler.log_error(
         error_code=error_code,
         message=str(exc.detail),
         request=request,
         request_id=request_id,
-        additional_context={"http_status_code": exc.status_code}
+        additional_context={"http_status_code": exc.status_code},
+        timestamp=now
     )
     
     # Create error response but preserve original HTTP status code
-    error_response = error_handler.create_error_response(error_code, str(exc.detail))
-    return JSONResponse(
+    error_response = error_handler.create_error_response(error_code, str(exc.detail), timestamp=now)
+    return ModelJSONResponse(
         status_code=exc.status_code,  # Preserve original status code
-        content=error_response.model_dump(mode='json')
+        content=error_response
     )
 
 
@@ -143,19 +164,22 @@ async def starlette_http_exception_handler(request: Request, exc: StarletteHTTPE
     else:
         error_code = ErrorCode.HTTP_500
     
+    # One timestamp for both the log record and the response
+    now = datetime.now(timezone.utc)
     error_handler.log_error(
         error_code=error_code,
         message=str(exc.detail),
         request=request,
         request_id=request_id,
-        additional_context={"http_status_code": exc.status_code}
+        additional_context={"http_status_code": exc.status_code},
+        timestamp=now
     )
     
     # Create error response but preserve original HTTP status code
-    error_response = error_handler.create_error_response(error_code, str(exc.detail))
-    return JSONResponse(
+    error_response = error_handler.create_error_response(error_code, str(exc.detail), timestamp=now)
+    return ModelJSONResponse(
         status_code=exc.status_code,  # Preserve original status code
-        content=error_response.model_dump(mode='json')
+        content=error_response
     )
 
 
@@ -177,30 +201,34 @@ async def pydantic_validation_exception_handler(request: Request, exc: Validatio
 async def anthropic_rate_limit_handler(request: Request, exc: RateLimitError):
     """Handle Anthropic API rate limit errors."""
     request_id = str(uuid.uuid4())
-    error_code, message = error_handler.handle_anthropic_error(exc, request, request_id)
-    return error_handler.create_json_response(error_code, message)
+    now = datetime.now(timezone.utc)
+    error_code, message = error_handler.handle_anthropic_error(exc, request, request_id, timestamp=now)
+    return error_handler.create_json_response(error_code, message, timestamp=now)
 
 
 @app.exception_handler(APITimeoutError)
 async def anthropic_timeout_handler(request: Request, exc: APITimeoutError):
     """Handle Anthropic API timeout errors."""
     request_id = str(uuid.uuid4())
-    error_code, message = error_handler.handle_anthropic_error(exc, request, request_id)
-    return error_handler.create_json_response(error_code, message)
+    now = datetime.now(timezone.utc)
+    error_code, message = error_handler.handle_anthropic_error(exc, request, request_id, timestamp=now)
+    return error_handler.create_json_response(error_code, message, timestamp=now)
 
 
 @app.exception_handler(APIError)
 async def anthropic_api_error_handler(request: Request, exc: APIError):
     """Handle Anthropic API errors."""
     request_id = str(uuid.uuid4())
-    error_code, message = error_handler.handle_anthropic_error(exc, request, request_id)
-    return error_handler.create_json_response(error_code, message)
+    now = datetime.now(timezone.utc)
+    error_code, message = error_handler.handle_anthropic_error(exc, request, request_id, timestamp=now)
+    return error_handler.create_json_response(error_code, message, timestamp=now)
 
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle general exceptions with centralized error handler."""
     request_id = str(uuid.uuid4())
+    now = datetime.now(timezone.utc)
     
     error_handler.log_error(
         error_code=ErrorCode.INTERNAL_SERVER_ERROR,
@@ -208,12 +236,14 @@ async def general_exception_handler(request: Request, exc: Exception):
         request=request,
         exception=exc,
         request_id=request_id,
-        additional_context={"exception_type": type(exc).__name__}
+        additional_context={"exception_type": type(exc).__name__},
+        timestamp=now
     )
     
     return error_handler.create_json_response(
         ErrorCode.INTERNAL_SERVER_ERROR,
-        "An unexpected error occurred"
+        "An unexpected error occurred",
+        timestamp=now
     )
 
 
@@ -259,7 +289,7 @@ async def clear_cache():
     return {"message": f"Cleared all cache entries ({removed_count} removed)"}
 
 
-@app.post("/parse-flight", response_model=FlightParseResponse)
+@app.post("/parse-flight", response_model=FlightParseResponse, responses=PARSE_ERROR_RESPONSES)
 async def parse_flight(
     request: FlightParseRequest,
     http_request: Request,
@@ -334,7 +364,7 @@ async def parse_flight(
         # Handle parsing-specific errors using centralized error handler
         error_code, message = error_handler.handle_parsing_error(e, http_request, request_id, url)
         raise HTTPException(
-            status_code=error_handler.ERROR_STATUS_MAPPING[error_code],
+            status_code=error_handler.get_status_code(error_code),
             detail=f"{error_code.value}: {message}"
         )
         
@@ -342,7 +372,7 @@ async def parse_flight(
         # Handle Anthropic API errors using centralized error handler
         error_code, message = error_handler.handle_anthropic_error(e, http_request, request_id, url)
         raise HTTPException(
-            status_code=error_handler.ERROR_STATUS_MAPPING[error_code],
+            status_code=error_handler.get_status_code(error_code),
             detail=f"{error_code.value}: {message}"
         )
         
@@ -350,7 +380,7 @@ async def parse_flight(
         # Handle HTTP client errors, network issues, and other errors
         error_code, message = error_handler.handle_http_error(e, http_request, request_id, url)
         raise HTTPException(
-            status_code=error_handler.ERROR_STATUS_MAPPING[error_code],
+            status_code=error_handler.get_status_code(error_code),
             detail=f"{error_code.value}: {message}"
         )
         
@@ -364,7 +394,7 @@ async def parse_flight(
             })
 
 
-@app.post("/parse-lodging", response_model=LodgingParseResponse)
+@app.post("/parse-lodging", response_model=LodgingParseResponse, responses=PARSE_ERROR_RESPONSES)
 async def parse_lodging(
     request: LodgingParseRequest,
     http_request: Request,
@@ -439,7 +469,7 @@ async def parse_lodging(
         # Handle parsing-specific errors using centralized error handler
         error_code, message = error_handler.handle_parsing_error(e, http_request, request_id, url)
         raise HTTPException(
-            status_code=error_handler.ERROR_STATUS_MAPPING[error_code],
+            status_code=error_handler.get_status_code(error_code),
             detail=f"{error_code.value}: {message}"
         )
         
@@ -447,7 +477,7 @@ async def parse_lodging(
         # Handle Anthropic API errors using centralized error handler
         error_code, message = error_handler.handle_anthropic_error(e, http_request, request_id, url)
         raise HTTPException(
-            status_code=error_handler.ERROR_STATUS_MAPPING[error_code],
+            status_code=error_handler.get_status_code(error_code),
             detail=f"{error_code.value}: {message}"
         )
         
@@ -455,7 +485,7 @@ async def parse_lodging(
         # Handle HTTP client errors, network issues, and other errors
         error_code, message = error_handler.handle_http_error(e, http_request, request_id, url)
         raise HTTPException(
-            status_code=error_handler.ERROR_STATUS_MAPPING[error_code],
+            status_code=error_handler.get_status_code(error_code),
             detail=f"{error_code.value}: {message}"
         )
         
@@ -1,6 +1,30 @@
 """Request models for the Travel Data Parser API."""
 
-from pydantic import BaseModel, HttpUrl, ConfigDict
+from typing import Annotated, Any
+
+from pydantic import AfterValidator, BaseModel, BeforeValidator, HttpUrl, ConfigDict
+
+
+# RFC 1035 limit on a single DNS label
+_MAX_HOST_LABEL_LENGTH = 63
+
+
+def _reject_whitespace(value: Any) -> Any:
+    """Reject links with embedded whitespace, which HttpUrl would silently percent-encode."""
+    if isinstance(value, str) and any(ch.isspace() for ch in value.strip()):
+        raise ValueError("URL must not contain whitespace")
+    return value
+
+
+def _check_host_labels(url: HttpUrl) -> HttpUrl:
+    """Reject hosts that can never resolve because a DNS label is too long."""
+    if url.host and any(len(label) > _MAX_HOST_LABEL_LENGTH for label in url.host.split(".")):
+        raise ValueError(f"URL host labels must be at most {_MAX_HOST_LABEL_LENGTH} characters")
+    return url
+
+
+# Booking link accepted by the parse endpoints
+BookingUrl = Annotated[HttpUrl, BeforeValidator(_reject_whitespace), AfterValidator(_check_host_labels)]
 
 
 class FlightParseRequest(BaseModel):
@@ -15,7 +39,7 @@ class FlightParseRequest(BaseModel):
         }
     )
     
-    link: HttpUrl
+    link: BookingUrl
 
 
 class LodgingParseRequest(BaseModel):
@@ -30,4 +54,4 @@ class LodgingParseRequest(BaseModel):
         }
     )
     
-    link: HttpUrl
\ No newline at end of file
+    link: BookingUrl
\ No newline at end of file
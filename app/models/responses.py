@@ -2,7 +2,7 @@
 
 from datetime import datetime, timezone
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
+from typing import Any, Dict, Optional
 
 
 class FlightParseResponse(BaseModel):
@@ -77,4 +77,8 @@ class ErrorResponse(BaseModel):
     timestamp: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc), 
         description="Error timestamp"
+    )
+    details: Optional[Dict[str, Any]] = Field(
+        None, 
+        description="Additional structured error details"
     )
\ No newline at end of file
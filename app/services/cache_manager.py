@@ -2,13 +2,30 @@
 Cache Manager service for TTL-based caching of LLM responses to reduce API costs.
 """
 
-import asyncio
 import hashlib
 import json
 import logging
 import time
-from typing import Dict, Any, Optional, Tuple
-from datetime import datetime, timedelta
+from typing import Dict, Any, Hashable, List, Optional
+
+
+_NS_PER_SECOND = 1_000_000_000
+
+
+class _Entry:
+    """
+    Mutable cache slot holding cached data and its bookkeeping fields.
+    """
+    
+    __slots__ = ('data', 'created_ns', 'expires_at_ns', 'access_count', 'size')
+    
+    def __init__(self, data: Optional[Dict[str, Any]] = None, created_ns: int = 0, expires_at_ns: int = 0, access_count: int = 0):
+        self.data = data
+        # Monotonic nanosecond readings; ages are derived with integer arithmetic
+        self.created_ns = created_ns
+        self.expires_at_ns = expires_at_ns
+        self.access_count = access_count
+        self.size = 0
 
 
 class CacheManager:
@@ -19,6 +36,13 @@ class CacheManager:
     repeated expensive API calls for the same content.
     """
     
+    __slots__ = (
+        'ttl', 'enabled', 'max_size', 'logger',
+        '_cache', '_entry_pool', '_entry_pool_size',
+        '_hits', '_misses', '_evictions', '_cleanups',
+        '_hit_rate', '_hit_rate_total'
+    )
+    
     def __init__(self, ttl: int = 3600, enabled: bool = True, max_size: int = 1000):
         """
         Initialize the Cache Manager.
@@ -33,44 +57,79 @@ class CacheManager:
         self.max_size = max_size
         self.logger = logging.getLogger(__name__)
         
-        # Cache storage: {cache_key: (data, timestamp, access_count)}
-        self._cache: Dict[str, Tuple[Dict[str, Any], float, int]] = {}
+        # Cache storage: {cache_key: _Entry}
+        self._cache: Dict[Hashable, _Entry] = {}
         
-        # Lock for thread-safe operations
-        self._lock = asyncio.Lock()
+        # Recycled entries, reused by set() instead of allocating new ones
+        self._entry_pool: List[_Entry] = []
+        self._entry_pool_size = min(128, max_size)
         
-        # Statistics
-        self._stats = {
-            'hits': 0,
-            'misses': 0,
-            'evictions': 0,
-            'cleanups': 0
-        }
+        # Statistics, kept as plain counters and only assembled into a dict by get_stats()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._cleanups = 0
+        
+        # Hit rate kept up to date on every lookup, with the hit+miss total it was computed from
+        self._hit_rate = 0.0
+        self._hit_rate_total = 0
         
         self.logger.info(f"CacheManager initialized: TTL={ttl}s, enabled={enabled}, max_size={max_size}")
     
-    def generate_cache_key(self, url: str, text_content: str, data_type: str) -> str:
+    def generate_cache_key(self, url: str, text_content: str, data_type: str) -> Hashable:
         """
         Generate a unique cache key based on URL and extracted text content.
         
+        The key is the ``(url, text_content, data_type)`` tuple itself; the
+        cache dict hashes it directly, so no digest has to be computed on the
+        request path. Use generate_cache_key_str() when a printable key is needed.
+        
         Args:
             url: Original URL that was scraped
             text_content: Extracted text content from the page
             data_type: Type of data being extracted ('flight' or 'lodging')
             
         Returns:
-            Unique cache key string
+            Hashable cache key
+        """
+        return (url, text_content, data_type)
+    
+    def generate_cache_key_str(self, *parts: Any) -> str:
+        """
+        Generate a short BLAKE2b hex fingerprint for the given key parts.
+        
+        Intended for logging and telemetry only; cache lookups use the key
+        returned by generate_cache_key(). Parts are JSON-encoded with sorted
+        keys, so structured values such as parameter dicts fingerprint stably.
+        
+        Args:
+            *parts: Key components, e.g. url, text_content and data_type
+            
+        Returns:
+            32-character hex digest string
         """
-        # Create a composite string for hashing
-        composite = f"{data_type}:{url}:{text_content}"
+        payload = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
         
-        # Generate SHA-256 hash for consistent key generation
-        cache_key = hashlib.sha256(composite.encode('utf-8')).hexdigest()
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _describe_key(self, cache_key: Hashable) -> str:
+        """
+        Build a short, printable label for a cache key.
+        
+        Tuple keys are fingerprinted rather than printed, so labels never
+        expose the user-submitted URL or page text.
         
-        self.logger.debug(f"Generated cache key: {cache_key[:16]}... for {data_type} data from {url}")
-        return cache_key
+        Args:
+            cache_key: Cache key to describe
+            
+        Returns:
+            Label suitable for logs and cache info output
+        """
+        if isinstance(cache_key, tuple):
+            return f"{self.generate_cache_key_str(*cache_key)[:16]}..."
+        return f"{str(cache_key)[:16]}..."
     
-    async def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+    async def get(self, cache_key: Hashable) -> Optional[Dict[str, Any]]:
         """
         Retrieve data from cache if available and not expired.
         
@@ -83,30 +142,45 @@ class CacheManager:
         if not self.enabled:
             return None
         
-        async with self._lock:
-            if cache_key not in self._cache:
-                self._stats['misses'] += 1
-                self.logger.debug(f"Cache miss for key: {cache_key[:16]}...")
-                return None
-            
-            data, timestamp, access_count = self._cache[cache_key]
-            current_time = time.time()
-            
-            # Check if cache entry has expired
-            if current_time - timestamp > self.ttl:
-                self.logger.debug(f"Cache entry expired for key: {cache_key[:16]}...")
-                del self._cache[cache_key]
-                self._stats['misses'] += 1
-                return None
-            
-            # Update access count and return data
-            self._cache[cache_key] = (data, timestamp, access_count + 1)
-            self._stats['hits'] += 1
+        return self._get_sync(cache_key)
+    
+    def _get_sync(self, cache_key: Hashable) -> Optional[Dict[str, Any]]:
+        """
+        Synchronous lookup core shared by get() and get_cached_or_compute().
+        
+        Performs a single dict probe, drops the entry if it has expired and
+        records the hit or miss. Nothing here awaits, so callers on the event
+        loop cannot interleave with it and no lock is needed.
+        
+        Args:
+            cache_key: Cache key to lookup
             
-            self.logger.info(f"Cache hit for key: {cache_key[:16]}... (age: {int(current_time - timestamp)}s)")
-            return data.copy()  # Return a copy to prevent external modifications
+        Returns:
+            Copy of the cached data if available and valid, None otherwise
+        """
+        entry = self._cache.get(cache_key)
+        if entry is None:
+            self._record_miss()
+            self.logger.debug(f"Cache miss for key: {self._describe_key(cache_key)}")
+            return None
+        
+        now_ns = time.monotonic_ns()
+        
+        # Check if cache entry has expired
+        if now_ns > entry.expires_at_ns:
+            self.logger.debug(f"Cache entry expired for key: {self._describe_key(cache_key)}")
+            self._release_entry(self._cache.pop(cache_key))
+            self._record_miss()
+            return None
+        
+        # Update access count and return data
+        entry.access_count += 1
+        self._record_hit()
+        
+        self.logger.info(f"Cache hit for key: {self._describe_key(cache_key)} (age: {(now_ns - entry.created_ns) // _NS_PER_SECOND}s)")
+        return entry.data.copy()  # Return a copy to prevent external modifications
     
-    async def set(self, cache_key: str, data: Dict[str, Any]) -> None:
+    async def set(self, cache_key: Hashable, data: Dict[str, Any]) -> None:
         """
         Store data in cache with current timestamp.
         
@@ -117,19 +191,37 @@ class CacheManager:
         if not self.enabled:
             return
         
-        async with self._lock:
-            current_time = time.time()
-            
-            # Check if we need to evict entries due to size limit
-            if len(self._cache) >= self.max_size and cache_key not in self._cache:
-                await self._evict_lru()
-            
-            # Store data with timestamp and initial access count
-            self._cache[cache_key] = (data.copy(), current_time, 1)
-            
-            self.logger.info(f"Cached data for key: {cache_key[:16]}... (size: {len(self._cache)})")
+        self._set_sync(cache_key, data)
+    
+    def _set_sync(self, cache_key: Hashable, data: Dict[str, Any]) -> None:
+        """
+        Synchronous store core used by set().
+        
+        Args:
+            cache_key: Cache key to store under
+            data: Data to cache
+        """
+        now_ns = time.monotonic_ns()
+        
+        # Check if we need to evict entries due to size limit
+        if len(self._cache) >= self.max_size and cache_key not in self._cache:
+            self._evict_lru()
+        
+        # Store data with timestamp and initial access count
+        entry = self._cache.get(cache_key)
+        if entry is None:
+            entry = self._entry_pool.pop() if self._entry_pool else _Entry()
+            self._cache[cache_key] = entry
+        entry.data = data.copy()
+        entry.created_ns = now_ns
+        entry.expires_at_ns = now_ns + self.ttl * _NS_PER_SECOND
+        entry.access_count = 1
+        # Measured once here so get_cache_info() can report it without re-serializing
+        entry.size = len(str(data))
+        
+        self.logger.info(f"Cached data for key: {self._describe_key(cache_key)} (size: {len(self._cache)})")
     
-    async def invalidate(self, cache_key: str) -> bool:
+    async def invalidate(self, cache_key: Hashable) -> bool:
         """
         Invalidate a specific cache entry.
         
@@ -142,12 +234,11 @@ class CacheManager:
         if not self.enabled:
             return False
         
-        async with self._lock:
-            if cache_key in self._cache:
-                del self._cache[cache_key]
-                self.logger.info(f"Invalidated cache entry: {cache_key[:16]}...")
-                return True
-            return False
+        if cache_key in self._cache:
+            self._release_entry(self._cache.pop(cache_key))
+            self.logger.info(f"Invalidated cache entry: {self._describe_key(cache_key)}")
+            return True
+        return False
     
     async def cleanup_expired(self) -> int:
         """
@@ -159,23 +250,22 @@ class CacheManager:
         if not self.enabled:
             return 0
         
-        async with self._lock:
-            current_time = time.time()
-            expired_keys = []
-            
-            for cache_key, (data, timestamp, access_count) in self._cache.items():
-                if current_time - timestamp > self.ttl:
-                    expired_keys.append(cache_key)
-            
-            for key in expired_keys:
-                del self._cache[key]
-            
-            removed_count = len(expired_keys)
-            if removed_count > 0:
-                self._stats['cleanups'] += 1
-                self.logger.info(f"Cleaned up {removed_count} expired cache entries")
-            
-            return removed_count
+        # Bind hot attributes to locals once instead of per entry
+        cache = self._cache
+        release = self._release_entry
+        now_ns = time.monotonic_ns()
+        
+        expired_keys = [key for key, entry in cache.items() if entry.expires_at_ns < now_ns]
+        
+        for key in expired_keys:
+            release(cache.pop(key))
+        
+        removed_count = len(expired_keys)
+        if removed_count > 0:
+            self._cleanups += 1
+            self.logger.info(f"Cleaned up {removed_count} expired cache entries")
+        
+        return removed_count
     
     async def clear(self) -> int:
         """
@@ -184,13 +274,14 @@ class CacheManager:
         Returns:
             Number of entries removed
         """
-        async with self._lock:
-            count = len(self._cache)
-            self._cache.clear()
-            self.logger.info(f"Cleared all cache entries ({count} removed)")
-            return count
+        count = len(self._cache)
+        # Swap in a fresh dict rather than clearing in place; the old table
+        # is released in one step and refilling starts from a clean table
+        self._cache = {}
+        self.logger.info(f"Cleared all cache entries ({count} removed)")
+        return count
     
-    async def _evict_lru(self) -> None:
+    def _evict_lru(self) -> None:
         """
         Evict least recently used cache entry to make space.
         """
@@ -200,12 +291,46 @@ class CacheManager:
         # Find the entry with the oldest timestamp and lowest access count
         lru_key = min(
             self._cache.keys(),
-            key=lambda k: (self._cache[k][2], self._cache[k][1])  # Sort by access_count, then timestamp
+            key=lambda k: (self._cache[k].access_count, self._cache[k].created_ns)  # Sort by access_count, then timestamp
         )
         
-        del self._cache[lru_key]
-        self._stats['evictions'] += 1
-        self.logger.debug(f"Evicted LRU cache entry: {lru_key[:16]}...")
+        self._release_entry(self._cache.pop(lru_key))
+        self._evictions += 1
+        self.logger.debug(f"Evicted LRU cache entry: {self._describe_key(lru_key)}")
+    
+    def _release_entry(self, entry: _Entry) -> None:
+        """
+        Return a removed entry to the pool so set() can reuse it.
+        
+        Args:
+            entry: Entry that has just been removed from the cache
+        """
+        if len(self._entry_pool) < self._entry_pool_size:
+            entry.data = None
+            self._entry_pool.append(entry)
+    
+    def _record_hit(self) -> None:
+        """
+        Count a cache hit and refresh the hit rate.
+        """
+        self._hits += 1
+        self._update_hit_rate()
+    
+    def _record_miss(self) -> None:
+        """
+        Count a cache miss and refresh the hit rate.
+        """
+        self._misses += 1
+        self._update_hit_rate()
+    
+    def _update_hit_rate(self) -> None:
+        """
+        Recompute the cached hit rate from the hit and miss counters.
+        """
+        hits = self._hits
+        total = hits + self._misses
+        self._hit_rate = hits / total if total else 0.0
+        self._hit_rate_total = total
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -214,21 +339,20 @@ class CacheManager:
         Returns:
             Dictionary containing cache statistics
         """
-        hit_rate = 0.0
-        total_requests = self._stats['hits'] + self._stats['misses']
-        if total_requests > 0:
-            hit_rate = self._stats['hits'] / total_requests
+        # Recompute only if the counters moved without going through _record_*
+        if self._hits + self._misses != self._hit_rate_total:
+            self._update_hit_rate()
         
         return {
             'enabled': self.enabled,
             'ttl': self.ttl,
             'max_size': self.max_size,
             'current_size': len(self._cache),
-            'hits': self._stats['hits'],
-            'misses': self._stats['misses'],
-            'hit_rate': round(hit_rate, 3),
-            'evictions': self._stats['evictions'],
-            'cleanups': self._stats['cleanups']
+            'hits': self._hits,
+            'misses': self._misses,
+            'hit_rate': round(self._hit_rate, 3),
+            'evictions': self._evictions,
+            'cleanups': self._cleanups
         }
     
     def get_cache_info(self) -> Dict[str, Any]:
@@ -238,19 +362,19 @@ class CacheManager:
         Returns:
             Dictionary containing detailed cache information
         """
-        current_time = time.time()
+        now_ns = time.monotonic_ns()
         entries = []
         
-        for cache_key, (data, timestamp, access_count) in self._cache.items():
-            age = int(current_time - timestamp)
+        for cache_key, entry in self._cache.items():
+            age = (now_ns - entry.created_ns) // _NS_PER_SECOND
             expires_in = max(0, self.ttl - age)
             
             entries.append({
-                'key': cache_key[:16] + '...',
+                'key': self._describe_key(cache_key),
                 'age_seconds': age,
                 'expires_in_seconds': expires_in,
-                'access_count': access_count,
-                'data_size': len(str(data))
+                'access_count': entry.access_count,
+                'data_size': entry.size
             })
         
         # Sort by age (newest first)
@@ -263,7 +387,7 @@ class CacheManager:
     
     async def get_cached_or_compute(
         self, 
-        cache_key: str, 
+        cache_key: Hashable, 
         compute_func, 
         *args, 
         **kwargs
@@ -282,10 +406,11 @@ class CacheManager:
         Returns:
             Cached or computed data
         """
-        # Try to get from cache first
-        cached_data = await self.get(cache_key)
-        if cached_data is not None:
-            return cached_data
+        # Try the cache first
+        if self.enabled:
+            cached_data = self._get_sync(cache_key)
+            if cached_data is not None:
+                return cached_data
         
         # Cache miss - compute the data
         computed_data = await compute_func(*args, **kwargs)
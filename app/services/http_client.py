@@ -5,14 +5,20 @@ for web scraping travel booking sites.
 
 import asyncio
 import random
+import re
 import time
-from collections import defaultdict
-from typing import Dict, List, Optional
+from collections import defaultdict, deque
+from typing import Awaitable, Callable, Deque, Dict, Optional
 import httpx
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Host part of an absolute URL: skips the scheme and any user info, then takes
+# either a bracketed IPv6 literal (without its brackets) or a name that stops at
+# the port, path, query or fragment
+_DOMAIN_RE = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.\-]*://(?:[^/?#@]*@)?(?:\[([^\]]+)\]|([^/:?#\[]+))")
+
 
 class UserAgentRotator:
     """Rotates User-Agent headers to avoid detection"""
@@ -28,44 +34,61 @@ class UserAgentRotator:
         "Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:120.0) Gecko/20100101 Firefox/120.0"
     ]
     
+    # Size of the pre-shuffled ring; a power of two so the index wraps with a mask
+    RING_SIZE = 256
+    
+    def __init__(self):
+        # Shuffle once up front; each call then just steps through the ring
+        copies = self.RING_SIZE // len(self.USER_AGENTS) + 1
+        self._ring = random.sample(self.USER_AGENTS * copies, self.RING_SIZE)
+        self._index = 0
+    
     def get_random_user_agent(self) -> str:
         """Get a random User-Agent string"""
-        return random.choice(self.USER_AGENTS)
+        self._index = (self._index + 1) & (self.RING_SIZE - 1)
+        return self._ring[self._index]
 
 
 class RateLimiter:
     """Rate limiter to prevent IP blocking from external sites"""
     
-    def __init__(self, requests_per_minute: int = 30):
+    def __init__(
+        self,
+        requests_per_minute: int = 30,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ):
         self.requests_per_minute = requests_per_minute
-        self.request_times: Dict[str, List[float]] = defaultdict(list)
+        self.request_times: Dict[str, Deque[float]] = defaultdict(deque)
         self._lock = asyncio.Lock()
+        # Injectable so tests can drive the limiter without real waits
+        self._clock = clock
+        self._sleep = sleep
     
     async def acquire(self, domain: str) -> None:
         """Acquire rate limit permission for a domain"""
         async with self._lock:
-            current_time = time.time()
+            current_time = self._clock()
             domain_requests = self.request_times[domain]
             
-            # Remove requests older than 1 minute
+            # Remove requests older than 1 minute; times are appended in
+            # order, so expired ones are always at the left end
             cutoff_time = current_time - 60
-            self.request_times[domain] = [
-                req_time for req_time in domain_requests 
-                if req_time > cutoff_time
-            ]
+            while domain_requests and domain_requests[0] <= cutoff_time:
+                domain_requests.popleft()
             
             # Check if we're at the rate limit
-            if len(self.request_times[domain]) >= self.requests_per_minute:
+            if len(domain_requests) >= self.requests_per_minute:
                 # Calculate wait time until oldest request expires
-                oldest_request = min(self.request_times[domain])
+                oldest_request = domain_requests[0]
                 wait_time = 60 - (current_time - oldest_request)
                 
                 if wait_time > 0:
                     logger.info(f"Rate limit reached for {domain}, waiting {wait_time:.2f} seconds")
-                    await asyncio.sleep(wait_time)
+                    await self._sleep(wait_time)
             
             # Record this request
-            self.request_times[domain].append(current_time)
+            domain_requests.append(current_time)
 
 
 class AsyncHttpClient:
@@ -74,14 +97,28 @@ class AsyncHttpClient:
     for scraping travel booking sites.
     """
     
+    # Static request headers; only the User-Agent is filled in per request
+    BASE_HEADERS = {
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.5",
+        "Accept-Encoding": "gzip, deflate, br",
+        "DNT": "1",
+        "Connection": "keep-alive",
+        "Upgrade-Insecure-Requests": "1",
+    }
+    
     def __init__(
         self,
         timeout: int = 60,
         max_retries: int = 3,
-        requests_per_minute: int = 30
+        requests_per_minute: int = 30,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
     ):
         self.timeout = timeout
         self.max_retries = max_retries
+        # Used for retry backoff; injectable so tests can skip the real waits
+        self._sleep = sleep
         self.user_agent_rotator = UserAgentRotator()
         self.rate_limiter = RateLimiter(requests_per_minute)
         
@@ -89,27 +126,23 @@ class AsyncHttpClient:
         self.client = httpx.AsyncClient(
             timeout=httpx.Timeout(timeout),
             follow_redirects=True,
-            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            transport=transport
         )
     
     def _get_domain(self, url: str) -> str:
         """Extract domain from URL for rate limiting"""
-        try:
-            parsed = httpx.URL(url)
-            return parsed.host or "unknown"
-        except Exception:
+        match = _DOMAIN_RE.match(url)
+        if match is None:
             return "unknown"
+        return (match.group(1) or match.group(2)).lower()
     
-    def _get_headers(self) -> Dict[str, str]:
-        """Get headers with rotated User-Agent"""
+    def _get_headers(self, overrides: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Get headers with rotated User-Agent, letting ``overrides`` win on conflicts"""
         return {
+            **self.BASE_HEADERS,
             "User-Agent": self.user_agent_rotator.get_random_user_agent(),
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate, br",
-            "DNT": "1",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1",
+            **(overrides or {}),
         }
     
     async def _make_request_with_retry(
@@ -127,14 +160,8 @@ class AsyncHttpClient:
                 domain = self._get_domain(url)
                 await self.rate_limiter.acquire(domain)
                 
-                # Add headers if not provided
-                if "headers" not in kwargs:
-                    kwargs["headers"] = self._get_headers()
-                else:
-                    # Merge with default headers, keeping user-provided ones
-                    default_headers = self._get_headers()
-                    default_headers.update(kwargs["headers"])
-                    kwargs["headers"] = default_headers
+                # Add default headers, keeping any user-provided ones
+                kwargs["headers"] = self._get_headers(kwargs.get("headers"))
                 
                 logger.debug(f"Making {method} request to {url} (attempt {attempt + 1})")
                 
@@ -173,7 +200,7 @@ class AsyncHttpClient:
             if attempt < self.max_retries:
                 delay = (2 ** attempt) + random.uniform(0, 1)
                 logger.info(f"Retrying {url} in {delay:.2f} seconds")
-                await asyncio.sleep(delay)
+                await self._sleep(delay)
         
         # All retries exhausted
         logger.error(f"All retries exhausted for {url}")
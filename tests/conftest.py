@@ -0,0 +1,72 @@
+"""
+Shared pytest fixtures.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
+
+
+class FakeClock:
+    """Controllable monotonic clock for timing and rate limiter tests."""
+    
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Create one test client for the whole session, running the app lifespan once."""
+    # Imported here so collecting tests that never touch the app doesn't load it
+    from app.main import app
+    
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def async_client():
+    """Create an in-process ASGI client shared across the session."""
+    from app.main import app
+    
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.fixture
+def override_parser(request):
+    """Install a mock parser as the app's parser dependency for one test."""
+    from app.main import app, get_universal_parser
+    
+    request.addfinalizer(app.dependency_overrides.clear)
+    
+    def _apply(mock_parser):
+        # An async provider is awaited inline; a plain lambda would make FastAPI
+        # resolve the dependency on a threadpool worker for every request
+        async def _provide():
+            return mock_parser
+        
+        app.dependency_overrides[get_universal_parser] = _provide
+    
+    return _apply
+
+
+@pytest.fixture
+def no_backoff():
+    """Stand-in sleep to pass as AsyncHttpClient(sleep=...) so retry tests skip real backoff."""
+    return AsyncMock()
+
+
+@pytest.fixture
+def clock():
+    """Fake monotonic clock to pass wherever a ``clock`` callable is accepted."""
+    return FakeClock()
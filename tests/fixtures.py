@@ -45,7 +45,8 @@ class BookingURLFixtures:
         ],
         "hotels_com": [
             "https://www.hotels.com/ho123456/2024-06-15/2024-06-18/2-adults?pos=HCOM_US&locale=en_US",
-            "https://www.hotels.com/ho789012/2024-07-10/2024-07-17/4-adults-2-children?pos=HCOM_US&locale=en_US"
+            "https://www.hotels.com/ho789012/2024-07-10/2024-07-17/4-adults-2-children?pos=HCOM_US&locale=en_US",
+            "https://www.hotels.com/ho345678/2024-08-05/2024-08-12/1-adult?pos=HCOM_US&locale=en_US"
         ],
         "vrbo": [
             "https://www.vrbo.com/1234567?arrival=2024-06-15&departure=2024-06-18&adults=4&children=2",
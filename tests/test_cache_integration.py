@@ -2,6 +2,7 @@
 Integration tests for CacheManager with UniversalParser.
 """
 
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 
@@ -12,6 +13,51 @@ from app.services.text_extractor import TextExtractor
 from app.services.llm_data_extractor import LLMDataExtractor
 
 
+@pytest.fixture
+def mock_http_client():
+    """Create a mock HTTP client."""
+    client = AsyncMock(spec=AsyncHttpClient)
+    response = MagicMock()
+    response.text = "<html><body>Flight from JFK to LAX, $299</body></html>"
+    response.raise_for_status = MagicMock()
+    client.get.return_value = response
+    return client
+
+
+@pytest.fixture
+def mock_text_extractor():
+    """Create a mock text extractor."""
+    extractor = MagicMock(spec=TextExtractor)
+    extractor.extract_text.return_value = "Flight from JFK to LAX, $299"
+    return extractor
+
+
+@pytest.fixture
+def mock_llm_extractor():
+    """Create a mock LLM extractor."""
+    extractor = AsyncMock(spec=LLMDataExtractor)
+    extractor.extract_flight_data.return_value = {
+        "origin_airport": "JFK",
+        "destination_airport": "LAX",
+        "duration": 360,
+        "total_cost": 299.0,
+        "total_cost_per_person": 299.0,
+        "segment": 1,
+        "flight_number": "AA123"
+    }
+    extractor.extract_lodging_data.return_value = {
+        "name": "Hotel ABC",
+        "location": "New York, NY",
+        "number_of_guests": 2,
+        "total_cost": 200.0,
+        "total_cost_per_person": 100,
+        "number_of_nights": 3,
+        "check_in": "2024-06-01",
+        "check_out": "2024-06-04"
+    }
+    return extractor
+
+
 class TestCacheIntegration:
     """Test cache integration with UniversalParser."""
     
@@ -20,48 +66,6 @@ class TestCacheIntegration:
         """Create a CacheManager for testing."""
         return CacheManager(ttl=60, enabled=True, max_size=100)
     
-    @pytest.fixture
-    def mock_http_client(self):
-        """Create a mock HTTP client."""
-        client = AsyncMock(spec=AsyncHttpClient)
-        response = MagicMock()
-        response.text = "<html><body>Flight from JFK to LAX, $299</body></html>"
-        response.raise_for_status = MagicMock()
-        client.get.return_value = response
-        return client
-    
-    @pytest.fixture
-    def mock_text_extractor(self):
-        """Create a mock text extractor."""
-        extractor = MagicMock(spec=TextExtractor)
-        extractor.extract_text.return_value = "Flight from JFK to LAX, $299"
-        return extractor
-    
-    @pytest.fixture
-    def mock_llm_extractor(self):
-        """Create a mock LLM extractor."""
-        extractor = AsyncMock(spec=LLMDataExtractor)
-        extractor.extract_flight_data.return_value = {
-            "origin_airport": "JFK",
-            "destination_airport": "LAX",
-            "duration": 360,
-            "total_cost": 299.0,
-            "total_cost_per_person": 299.0,
-            "segment": 1,
-            "flight_number": "AA123"
-        }
-        extractor.extract_lodging_data.return_value = {
-            "name": "Hotel ABC",
-            "location": "New York, NY",
-            "number_of_guests": 2,
-            "total_cost": 200.0,
-            "total_cost_per_person": 100,
-            "number_of_nights": 3,
-            "check_in": "2024-06-01",
-            "check_out": "2024-06-04"
-        }
-        return extractor
-    
     @pytest.mark.asyncio
     async def test_flight_parsing_with_cache_miss_then_hit(
         self, cache_manager, mock_http_client, mock_text_extractor, mock_llm_extractor
@@ -375,12 +379,12 @@ class TestCacheEndpointIntegration:
     
     def test_cache_clear_endpoint_if_exists(self, client):
         """Test cache clear endpoint if it exists."""
-        response = client.post("/cache/clear")
+        response = client.delete("/cache/clear")
         
         if response.status_code == 200:
             # Cache clear endpoint exists and is working
             data = response.json()
-            assert "cleared" in data or "removed" in data
+            assert "cleared" in data["message"].lower()
         else:
             # Cache clear endpoint might not be implemented yet
             assert response.status_code == 404
@@ -555,7 +559,6 @@ class TestCachePerformanceIntegration:
             await cache.set(f"cleanup_test_{i}", {"data": i})
         
         # Wait for entries to expire
-        import asyncio
         await asyncio.sleep(1.1)
         
         # Add more entries to trigger cleanup
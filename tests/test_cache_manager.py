@@ -46,10 +46,21 @@ class TestCacheManager:
         # Generate cache key
         cache_key = cache_manager.generate_cache_key(url, text_content, data_type)
         
-        # Verify key is a string and has expected length (SHA-256 hex)
-        assert isinstance(cache_key, str)
-        assert len(cache_key) == 64
-        
+        # Verify key is the hashable input tuple
+        assert cache_key == (url, text_content, data_type)
+        hash(cache_key)
+
+        # Verify the printable shim produces a 16-byte BLAKE2b hex digest
+        key_str = cache_manager.generate_cache_key_str(url, text_content, data_type)
+        assert isinstance(key_str, str)
+        assert len(key_str) == 32
+        
+        # Structured parts fingerprint independently of dict ordering
+        assert (
+            cache_manager.generate_cache_key_str(url, {"adults": 2, "cabin": "economy"})
+            == cache_manager.generate_cache_key_str(url, {"cabin": "economy", "adults": 2})
+        )
+
         # Verify same inputs produce same key
         cache_key2 = cache_manager.generate_cache_key(url, text_content, data_type)
         assert cache_key == cache_key2
@@ -230,7 +241,31 @@ class TestCacheManager:
         # Check eviction statistics
         stats = cache_manager.get_stats()
         assert stats['evictions'] >= 1
-    
+
+    @pytest.mark.asyncio
+    async def test_evicted_entries_are_reused(self, cache_manager):
+        """Test that evicted entries are recycled for new cache sets."""
+        await cache_manager.set("key1", {"data": 1})
+        await cache_manager.set("key2", {"data": 2})
+        await cache_manager.set("key3", {"data": 3})
+        evicted_entry = cache_manager._cache["key1"]
+
+        # Evicting key1 hands its entry straight to key4
+        await cache_manager.set("key4", {"data": 4})
+        assert cache_manager._cache["key4"] is evicted_entry
+        assert cache_manager._entry_pool == []
+
+        # Invalidated entries are pooled until the next new key
+        invalidated_entry = cache_manager._cache["key2"]
+        await cache_manager.invalidate("key2")
+        assert cache_manager._entry_pool == [invalidated_entry]
+        assert invalidated_entry.data is None
+
+        await cache_manager.set("key5", {"data": 5})
+        assert cache_manager._cache["key5"] is invalidated_entry
+        assert await cache_manager.get("key5") == {"data": 5}
+        assert await cache_manager.get("key4") == {"data": 4}
+
     @pytest.mark.asyncio
     async def test_disabled_cache_operations(self, disabled_cache_manager):
         """Test that disabled cache doesn't perform operations."""
@@ -301,6 +336,21 @@ class TestCacheManager:
             assert 'expires_in_seconds' in entry
             assert 'access_count' in entry
             assert 'data_size' in entry
+        
+        # Data size reflects the stored payload
+        sizes = sorted(entry['data_size'] for entry in entries)
+        assert sizes == [len(str({"data": 1})), len(str({"data": 2}))]
+    
+    @pytest.mark.asyncio
+    async def test_cache_info_hides_urls(self, cache_manager):
+        """Test that cache info labels tuple keys without exposing the URL."""
+        url = "https://example.com/flights?token=secret"
+        cache_key = cache_manager.generate_cache_key(url, "content", "flight")
+        await cache_manager.set(cache_key, {"data": 1})
+        
+        label = cache_manager.get_cache_info()['entries'][0]['key']
+        assert "example.com" not in label
+        assert label == f"{cache_manager.generate_cache_key_str(*cache_key)[:16]}..."
     
     @pytest.mark.asyncio
     async def test_get_cached_or_compute(self, cache_manager):
@@ -329,6 +379,11 @@ class TestCacheManager:
         
         assert result == expected_result
         compute_func.assert_not_called()  # Should not be called due to cache hit
+        
+        # Both the miss and the hit are counted
+        stats = cache_manager.get_stats()
+        assert stats['misses'] == 1
+        assert stats['hits'] == 1
     
     @pytest.mark.asyncio
     async def test_cache_access_count_tracking(self, cache_manager):
@@ -397,8 +452,8 @@ class TestCacheManager:
         assert stats['hit_rate'] == 0.0
         
         # Simulate some hits and misses manually
-        cache_manager._stats['hits'] = 7
-        cache_manager._stats['misses'] = 3
+        cache_manager._hits = 7
+        cache_manager._misses = 3
         
         stats = cache_manager.get_stats()
         assert stats['hit_rate'] == 0.7  # 7/(7+3) = 0.7
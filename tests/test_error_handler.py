@@ -9,12 +9,13 @@ failure scenarios.
 import json
 import logging
 import time
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, MagicMock
 from typing import Dict, Any
 
 import pytest
-from fastapi import Request
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 from anthropic import APIError, RateLimitError, APITimeoutError
@@ -23,6 +24,35 @@ from app.core.error_handler import ErrorHandler, ErrorCode
 from app.models.responses import ErrorResponse
 
 
+def _read_json(response: JSONResponse) -> Any:
+    """Parse a response body; json.loads accepts the raw bytes directly."""
+    return json.loads(response.body)
+
+
+class CapturingLogger:
+    """Minimal logger stand-in that records error() calls."""
+    
+    def __init__(self):
+        self.enabled = True
+        self.calls = []
+    
+    def isEnabledFor(self, level: int) -> bool:
+        return self.enabled
+    
+    def error(self, *args, **kwargs) -> None:
+        self.calls.append((args, kwargs))
+
+
+@dataclass(frozen=True, slots=True)
+class FakeRequest:
+    """Lightweight stand-in for the request attributes log_error reads."""
+    
+    method: str
+    url: str
+    client: SimpleNamespace
+    headers: Dict[str, str]
+
+
 class TestErrorCode:
     """Test the ErrorCode enumeration."""
     
@@ -52,25 +82,24 @@ class TestErrorHandler:
     """Test the ErrorHandler class functionality."""
     
     @pytest.fixture
-    def mock_logger(self):
-        """Create a mock logger for testing."""
-        return Mock(spec=logging.Logger)
+    def logger(self):
+        """Create a capturing logger for testing."""
+        return CapturingLogger()
     
     @pytest.fixture
-    def error_handler(self, mock_logger):
-        """Create an ErrorHandler instance with mock logger."""
-        return ErrorHandler(logger=mock_logger)
+    def error_handler(self, logger, clock):
+        """Create an ErrorHandler instance with capturing logger and fake clock."""
+        return ErrorHandler(logger=logger, clock=clock)
     
     @pytest.fixture
-    def mock_request(self):
-        """Create a mock FastAPI request object."""
-        request = Mock(spec=Request)
-        request.method = "POST"
-        request.url = "http://localhost:8000/parse-flight"
-        request.client = Mock()
-        request.client.host = "127.0.0.1"
-        request.headers = {"user-agent": "test-agent"}
-        return request
+    def fake_request(self):
+        """Create a stand-in FastAPI request object."""
+        return FakeRequest(
+            method="POST",
+            url="http://localhost:8000/parse-flight",
+            client=SimpleNamespace(host="127.0.0.1"),
+            headers={"user-agent": "test-agent"}
+        )
     
     def test_error_status_mapping(self, error_handler):
         """Test that error codes map to correct HTTP status codes."""
@@ -90,6 +119,16 @@ class TestErrorHandler:
         assert error_handler.ERROR_STATUS_MAPPING[ErrorCode.LLM_RATE_LIMITED] == 429
         assert error_handler.ERROR_STATUS_MAPPING[ErrorCode.LLM_QUOTA_EXCEEDED] == 429
     
+    def test_get_status_code(self, error_handler):
+        """Test that status code lookups agree with the mapping for every code."""
+        for error_code in ErrorCode:
+            expected = error_handler.ERROR_STATUS_MAPPING.get(error_code, 500)
+            assert error_handler.get_status_code(error_code) == expected
+    
+    def test_error_code_ordinals(self):
+        """Test that error code ordinals are dense and follow definition order."""
+        assert [code.ordinal for code in ErrorCode] == list(range(len(ErrorCode)))
+    
     def test_error_messages(self, error_handler):
         """Test that error codes have default messages."""
         assert "Invalid or malformed URL" in error_handler.ERROR_MESSAGES[ErrorCode.INVALID_URL]
@@ -122,10 +161,30 @@ class TestErrorHandler:
             details=details
         )
         
-        assert "Details:" in response.message
-        assert str(details) in response.message
+        assert response.details == details
+        assert "Details:" not in response.message
+    
+    def test_shared_timestamp(self, error_handler, logger):
+        """Test that a caller-supplied timestamp is used for both log and response."""
+        now = datetime(2024, 1, 15, 10, 30, tzinfo=timezone.utc)
+        
+        error_handler.log_error(ErrorCode.INVALID_URL, "Bad URL", timestamp=now)
+        response = error_handler.create_error_response(ErrorCode.INVALID_URL, timestamp=now)
+        
+        assert logger.calls[-1][1]["extra"]["context"]["timestamp"] == now.isoformat()
+        assert response.timestamp == now
     
-    def test_request_timing(self, error_handler):
+    def test_handlers_forward_timestamp(self, error_handler, logger):
+        """Test that the handle_* helpers log with a caller-supplied timestamp."""
+        now = datetime(2024, 1, 15, 10, 30, tzinfo=timezone.utc)
+        
+        error_handler.handle_anthropic_error(Exception("API down"), timestamp=now)
+        error_handler.handle_parsing_error(ValueError("Parsing failed"), timestamp=now)
+        error_handler.handle_http_error(Exception("Connection refused"), timestamp=now)
+        
+        assert [call[1]["extra"]["context"]["timestamp"] for call in logger.calls] == [now.isoformat()] * 3
+    
+    def test_request_timing(self, error_handler, clock):
         """Test request timing functionality."""
         request_id = "test-request-123"
         
@@ -133,28 +192,26 @@ class TestErrorHandler:
         error_handler.start_request_timing(request_id)
         
         # Simulate some processing time
-        time.sleep(0.1)
+        clock.advance(0.1)
         
         # Get duration
         duration = error_handler.get_request_duration(request_id)
         
-        assert duration is not None
-        assert duration >= 0.1
-        assert duration < 1.0  # Should be less than 1 second
+        assert duration == pytest.approx(0.1)
         
         # Second call should return None (cleaned up)
         duration2 = error_handler.get_request_duration(request_id)
         assert duration2 is None
     
-    def test_log_error_basic(self, error_handler, mock_logger):
+    def test_log_error_basic(self, error_handler, logger):
         """Test basic error logging functionality."""
         error_handler.log_error(
             error_code=ErrorCode.INVALID_URL,
             message="Test error message"
         )
         
-        mock_logger.error.assert_called_once()
-        call_args = mock_logger.error.call_args
+        assert len(logger.calls) == 1
+        call_args = logger.calls[-1]
         
         # Check the log message
         assert "INVALID_URL: Test error message" in call_args[0][0]
@@ -165,23 +222,23 @@ class TestErrorHandler:
         assert context["error_code"] == "INVALID_URL"
         assert "timestamp" in context
     
-    def test_log_error_with_request(self, error_handler, mock_logger, mock_request):
+    def test_log_error_with_request(self, error_handler, logger, fake_request):
         """Test error logging with request context."""
         error_handler.log_error(
             error_code=ErrorCode.PARSING_FAILED,
             message="Parsing failed",
-            request=mock_request
+            request=fake_request
         )
         
-        mock_logger.error.assert_called_once()
-        context = mock_logger.error.call_args[1]["extra"]["context"]
+        assert len(logger.calls) == 1
+        context = logger.calls[-1][1]["extra"]["context"]
         
         assert context["method"] == "POST"
         assert "localhost:8000" in context["url"]
         assert context["client_ip"] == "127.0.0.1"
         assert context["user_agent"] == "test-agent"
     
-    def test_log_error_with_exception(self, error_handler, mock_logger):
+    def test_log_error_with_exception(self, error_handler, logger):
         """Test error logging with exception information."""
         test_exception = ValueError("Test exception")
         
@@ -191,19 +248,84 @@ class TestErrorHandler:
             exception=test_exception
         )
         
-        mock_logger.error.assert_called_once()
-        call_args = mock_logger.error.call_args
+        assert len(logger.calls) == 1
+        call_args = logger.calls[-1]
         
         # Should include exc_info=True when exception is provided
         assert call_args[1]["exc_info"] is True
     
-    def test_log_error_with_performance_metrics(self, error_handler, mock_logger):
+    def test_log_error_skipped_when_disabled(self, error_handler, logger):
+        """Test that nothing is logged when ERROR records are filtered out."""
+        logger.enabled = False
+        request_id = "test-request-disabled"
+        error_handler.start_request_timing(request_id)
+        
+        error_handler.log_error(
+            error_code=ErrorCode.INVALID_URL,
+            message="Test error message",
+            request_id=request_id
+        )
+        
+        assert logger.calls == []
+        # The timing entry is still released
+        assert error_handler.get_request_duration(request_id) is None
+    
+    def test_log_error_lazy_additional_context(self, error_handler, logger):
+        """Test that callable context is only built when the record is logged."""
+        build_context = Mock(return_value={"expensive": "value"})
+        
+        logger.enabled = False
+        error_handler.log_error(
+            error_code=ErrorCode.PARSING_FAILED,
+            message="Parsing failed",
+            additional_context=build_context
+        )
+        build_context.assert_not_called()
+        
+        logger.enabled = True
+        error_handler.log_error(
+            error_code=ErrorCode.PARSING_FAILED,
+            message="Parsing failed",
+            additional_context=build_context
+        )
+        build_context.assert_called_once_with()
+        context = logger.calls[-1][1]["extra"]["context"]
+        assert context["expensive"] == "value"
+    
+    async def test_log_error_batched(self, caplog):
+        """Test that batched error logs are buffered until flushed."""
+        handler = ErrorHandler(logger=logging.getLogger("test_error_handler.batched"))
+        caplog.set_level(logging.ERROR, logger="test_error_handler.batched")
+        
+        await handler.start_log_flusher()
+        assert handler.batching
+        handler.log_error(
+            error_code=ErrorCode.PARSING_FAILED,
+            message="Parsing failed",
+            exception=ValueError("Test exception")
+        )
+        assert caplog.records == []
+        
+        # Stopping flushes whatever is still buffered
+        await handler.stop_log_flusher()
+        assert not handler.batching
+        
+        assert len(caplog.records) == 1
+        record = caplog.records[0]
+        assert record.getMessage() == "PARSING_FAILED: Parsing failed"
+        assert record.levelno == logging.ERROR
+        assert record.exc_info[0] is ValueError
+        # Buffered records keep their call site like directly logged ones
+        assert record.pathname.endswith("error_handler.py")
+        assert record.lineno > 0
+    
+    def test_log_error_with_performance_metrics(self, error_handler, logger, clock):
         """Test error logging with performance metrics."""
         request_id = "test-request-456"
         
         # Start timing
         error_handler.start_request_timing(request_id)
-        time.sleep(0.05)  # Small delay
+        clock.advance(0.05)  # Small delay
         
         error_handler.log_error(
             error_code=ErrorCode.TIMEOUT,
@@ -211,14 +333,14 @@ class TestErrorHandler:
             request_id=request_id
         )
         
-        mock_logger.error.assert_called_once()
-        context = mock_logger.error.call_args[1]["extra"]["context"]
+        assert len(logger.calls) == 1
+        context = logger.calls[-1][1]["extra"]["context"]
         
         assert context["request_id"] == request_id
         assert "duration_seconds" in context
-        assert context["duration_seconds"] >= 0.05
+        assert context["duration_seconds"] == 0.05
     
-    def test_handle_anthropic_rate_limit_error(self, error_handler, mock_logger):
+    def test_handle_anthropic_rate_limit_error(self, error_handler, logger):
         """Test handling Anthropic rate limit errors."""
         # Create a mock RateLimitError with required parameters
         mock_response = Mock()
@@ -233,9 +355,9 @@ class TestErrorHandler:
         
         assert error_code == ErrorCode.LLM_RATE_LIMITED
         assert "rate limit exceeded" in message.lower()
-        mock_logger.error.assert_called_once()
+        assert len(logger.calls) == 1
     
-    def test_handle_anthropic_quota_exceeded_error(self, error_handler, mock_logger):
+    def test_handle_anthropic_quota_exceeded_error(self, error_handler, logger):
         """Test handling Anthropic quota exceeded errors."""
         # Create a mock RateLimitError with quota message
         mock_response = Mock()
@@ -251,7 +373,7 @@ class TestErrorHandler:
         assert error_code == ErrorCode.LLM_QUOTA_EXCEEDED
         assert "quota exceeded" in message.lower()
     
-    def test_handle_anthropic_timeout_error(self, error_handler, mock_logger):
+    def test_handle_anthropic_timeout_error(self, error_handler, logger):
         """Test handling Anthropic timeout errors."""
         # Create a mock APITimeoutError
         mock_request = Mock()
@@ -262,7 +384,7 @@ class TestErrorHandler:
         assert error_code == ErrorCode.LLM_TIMEOUT
         assert "timeout" in message.lower()
     
-    def test_handle_anthropic_api_error(self, error_handler, mock_logger):
+    def test_handle_anthropic_api_error(self, error_handler, logger):
         """Test handling general Anthropic API errors."""
         # Create a mock APIError with required parameters
         mock_request = Mock()
@@ -277,7 +399,7 @@ class TestErrorHandler:
         assert error_code == ErrorCode.LLM_API_ERROR
         assert "API error" in message
     
-    def test_handle_anthropic_api_error_with_status_code(self, error_handler, mock_logger):
+    def test_handle_anthropic_api_error_with_status_code(self, error_handler, logger):
         """Test handling Anthropic API errors with HTTP status codes."""
         # Create a mock APIError with status code
         mock_request = Mock()
@@ -294,7 +416,7 @@ class TestErrorHandler:
         assert error_code == ErrorCode.LLM_API_ERROR
         assert "HTTP 500" in message
     
-    def test_handle_parsing_error_invalid_url(self, error_handler, mock_logger):
+    def test_handle_parsing_error_invalid_url(self, error_handler, logger):
         """Test handling parsing errors for invalid URLs."""
         parsing_error = ValueError("Invalid URL format")
         
@@ -303,7 +425,7 @@ class TestErrorHandler:
         assert error_code == ErrorCode.INVALID_URL
         assert "Invalid URL format" in message
     
-    def test_handle_parsing_error_unsupported_platform(self, error_handler, mock_logger):
+    def test_handle_parsing_error_unsupported_platform(self, error_handler, logger):
         """Test handling parsing errors for unsupported platforms."""
         parsing_error = ValueError("Platform not supported")
         
@@ -312,7 +434,7 @@ class TestErrorHandler:
         assert error_code == ErrorCode.UNSUPPORTED_PLATFORM
         assert "Platform not supported" in message
     
-    def test_handle_parsing_error_parsing_failed(self, error_handler, mock_logger):
+    def test_handle_parsing_error_parsing_failed(self, error_handler, logger):
         """Test handling parsing failures."""
         parsing_error = ValueError("No meaningful text found")
         
@@ -321,7 +443,7 @@ class TestErrorHandler:
         assert error_code == ErrorCode.PARSING_FAILED
         assert "Failed to parse content" in message
     
-    def test_handle_parsing_error_missing_data(self, error_handler, mock_logger):
+    def test_handle_parsing_error_missing_data(self, error_handler, logger):
         """Test handling missing data errors."""
         parsing_error = ValueError("Required data not found")
         
@@ -330,7 +452,7 @@ class TestErrorHandler:
         assert error_code == ErrorCode.MISSING_DATA
         assert "Required data missing" in message
     
-    def test_handle_http_error_connection(self, error_handler, mock_logger):
+    def test_handle_http_error_connection(self, error_handler, logger):
         """Test handling HTTP connection errors."""
         http_error = Exception("Connection failed")
         
@@ -339,7 +461,7 @@ class TestErrorHandler:
         assert error_code == ErrorCode.URL_UNREACHABLE
         assert "Network connection error" in message
     
-    def test_handle_http_error_404(self, error_handler, mock_logger):
+    def test_handle_http_error_404(self, error_handler, logger):
         """Test handling HTTP 404 errors."""
         http_error = Exception("404 Not Found")
         
@@ -348,7 +470,7 @@ class TestErrorHandler:
         assert error_code == ErrorCode.URL_UNREACHABLE
         assert "URL not found (404)" in message
     
-    def test_handle_http_error_403(self, error_handler, mock_logger):
+    def test_handle_http_error_403(self, error_handler, logger):
         """Test handling HTTP 403 errors."""
         http_error = Exception("403 Forbidden")
         
@@ -357,7 +479,7 @@ class TestErrorHandler:
         assert error_code == ErrorCode.URL_UNREACHABLE
         assert "Access forbidden (403)" in message
     
-    def test_handle_http_error_rate_limit(self, error_handler, mock_logger):
+    def test_handle_http_error_rate_limit(self, error_handler, logger):
         """Test handling HTTP rate limit errors."""
         http_error = Exception("429 Rate limit exceeded")
         
@@ -366,7 +488,7 @@ class TestErrorHandler:
         assert error_code == ErrorCode.RATE_LIMITED
         assert "Rate limit exceeded" in message
     
-    def test_handle_http_error_timeout(self, error_handler, mock_logger):
+    def test_handle_http_error_timeout(self, error_handler, logger):
         """Test handling HTTP timeout errors."""
         http_error = Exception("Request timeout")
         
@@ -386,12 +508,13 @@ class TestErrorHandler:
         assert response.status_code == 400
         
         # Parse the response content
-        content = json.loads(response.body.decode())
+        content = _read_json(response)
         assert content["error"] == "INVALID_URL"
         assert content["message"] == "Custom error message"
         assert "timestamp" in content
+        assert "details" not in content
     
-    def test_handle_validation_error(self, error_handler, mock_logger):
+    def test_handle_validation_error(self, error_handler, logger):
         """Test handling Pydantic validation errors."""
         # Create a mock validation error
         validation_error = Mock(spec=ValidationError)
@@ -405,10 +528,10 @@ class TestErrorHandler:
         assert response.status_code == 422
         
         # Check that error was logged
-        mock_logger.error.assert_called_once()
+        assert len(logger.calls) == 1
         
         # Parse response content
-        content = json.loads(response.body.decode())
+        content = _read_json(response)
         assert content["error"] == "VALIDATION_ERROR"
         assert "Validation failed" in content["message"]
     
@@ -420,26 +543,26 @@ class TestErrorHandler:
         assert handler.logger is not None
         assert isinstance(handler.logger, logging.Logger)
     
-    def test_comprehensive_error_context(self, error_handler, mock_logger, mock_request):
+    def test_comprehensive_error_context(self, error_handler, logger, fake_request, clock):
         """Test that comprehensive context is logged for errors."""
         request_id = "comprehensive-test"
         url = "https://example.com/booking"
         additional_context = {"custom_field": "custom_value"}
         
         error_handler.start_request_timing(request_id)
-        time.sleep(0.01)
+        clock.advance(0.01)
         
         error_handler.log_error(
             error_code=ErrorCode.LLM_API_ERROR,
             message="Comprehensive error test",
-            request=mock_request,
+            request=fake_request,
             request_id=request_id,
             url=url,
             additional_context=additional_context
         )
         
-        mock_logger.error.assert_called_once()
-        context = mock_logger.error.call_args[1]["extra"]["context"]
+        assert len(logger.calls) == 1
+        context = logger.calls[-1][1]["extra"]["context"]
         
         # Check all context fields are present
         assert context["error_code"] == "LLM_API_ERROR"
@@ -473,9 +596,9 @@ class TestErrorHandlerIntegration:
             response = error_handler.handle_validation_error(e)
             
             assert response.status_code == 422
-            content = json.loads(response.body.decode())
+            content = _read_json(response)
             assert content["error"] == "VALIDATION_ERROR"
-            assert "validation_errors" in content["message"]
+            assert content["details"]["validation_errors"][0]["loc"] == ["required_field"]
     
     def test_error_response_serialization(self, error_handler):
         """Test that error responses can be properly serialized."""
@@ -518,7 +641,7 @@ class TestErrorHandlerIntegration:
         for i in range(3):
             thread = threading.Thread(
                 target=time_request,
-                args=(f"request-{i}", 0.1 + i * 0.05)
+                args=(f"request-{i}", 0.01 + i * 0.005)
             )
             threads.append(thread)
             thread.start()
@@ -532,4 +655,4 @@ class TestErrorHandlerIntegration:
         for i in range(3):
             request_id = f"request-{i}"
             assert request_id in results
-            assert results[request_id] >= 0.1 + i * 0.05
\ No newline at end of file
+            assert results[request_id] >= 0.01 + i * 0.005
\ No newline at end of file
@@ -6,7 +6,7 @@ import pytest
 import asyncio
 from unittest.mock import AsyncMock, patch, MagicMock
 from fastapi.testclient import TestClient
-from httpx import AsyncClient
+from httpx import ASGITransport, AsyncClient
 from datetime import datetime, timezone
 
 from app.main import app, get_universal_parser
@@ -379,7 +379,11 @@ class TestLodgingParsingEndpoint:
     
     def test_parse_lodging_missing_anthropic_key(self, client):
         """Test lodging parsing when Anthropic API key is not configured."""
-        with patch('app.core.config.settings.ANTHROPIC_API_KEY', ''):
+        from app.main import settings
+        
+        # Settings validates assignment and rejects an empty key, so swap in an
+        # unvalidated copy for the endpoint to read instead
+        with patch('app.main.settings', settings.model_copy(update={"ANTHROPIC_API_KEY": ""})):
             response = client.post(
                 "/parse-lodging",
                 json={"link": "https://www.airbnb.com/rooms/12345"}
@@ -395,7 +399,7 @@ class TestLodgingParsingEndpoint:
         """Test that lodging parsing handles async processing correctly."""
         app.dependency_overrides[get_universal_parser] = lambda: mock_parser_success
         try:
-            async with AsyncClient(app=app, base_url="http://test") as ac:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
                 response = await ac.post(
                     "/parse-lodging",
                     json={"link": "https://www.airbnb.com/rooms/12345"}
@@ -439,7 +443,7 @@ class TestLodgingParsingEndpoint:
         assert response.status_code == 500
         data = response.json()
         assert "error" in data
-        assert "PARSING_ERROR" in data["message"]
+        assert "PARSING_FAILED" in data["message"]
         
         mock_parser.close.assert_called_once()
     
@@ -8,7 +8,7 @@ import time
 import pytest
 from unittest.mock import AsyncMock, patch
 from fastapi.testclient import TestClient
-from httpx import AsyncClient
+from httpx import ASGITransport, AsyncClient
 from concurrent.futures import ThreadPoolExecutor
 
 from app.main import app, get_universal_parser
@@ -129,7 +129,7 @@ class TestPerformanceMetrics:
         """Test handling of concurrent flight parsing requests."""
         app.dependency_overrides[get_universal_parser] = lambda: mock_parser_fast
         try:
-            async with AsyncClient(app=app, base_url="http://test") as ac:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
                 # Create multiple concurrent requests
                 tasks = []
                 for i in range(10):
@@ -161,7 +161,7 @@ class TestPerformanceMetrics:
         """Test handling of concurrent mixed flight and lodging requests."""
         app.dependency_overrides[get_universal_parser] = lambda: mock_parser_fast
         try:
-            async with AsyncClient(app=app, base_url="http://test") as ac:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
                 # Create mixed concurrent requests
                 flight_tasks = []
                 lodging_tasks = []
@@ -235,7 +235,7 @@ class TestPerformanceMetrics:
         
         app.dependency_overrides[get_universal_parser] = lambda: mock_parser
         try:
-            async with AsyncClient(app=app, base_url="http://test") as ac:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
                 # Test multiple requests with variable latency
                 response_times = []
                 
@@ -293,7 +293,7 @@ class TestPerformanceMetrics:
         """Test that timeout handling doesn't block other requests."""
         app.dependency_overrides[get_universal_parser] = lambda: mock_parser_slow
         try:
-            async with AsyncClient(app=app, base_url="http://test") as ac:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
                 # Start a slow request that should timeout
                 slow_task = ac.post(
                     "/parse-flight",
@@ -433,7 +433,7 @@ class TestLoadTesting:
         
         app.dependency_overrides[get_universal_parser] = lambda: mock_parser
         try:
-            async with AsyncClient(app=app, base_url="http://test") as ac:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
                 # Simulate sustained load over time
                 total_requests = 100
                 batch_size = 10
@@ -491,7 +491,7 @@ class TestLoadTesting:
         
         app.dependency_overrides[get_universal_parser] = lambda: mock_parser
         try:
-            async with AsyncClient(app=app, base_url="http://test") as ac:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
                 # Create a sudden burst of 50 concurrent requests
                 burst_size = 50
                 tasks = []
@@ -94,12 +94,23 @@ class TestTask13Completion:
         # This requirement is validated by test_error_scenarios.py
         from tests.test_error_scenarios import TestNetworkFailures, TestLLMAPIErrors, TestParsingFailures
         
-        # Check error scenario test methods
-        network_test_methods = [method for method in dir(TestNetworkFailures) if method.startswith('test_')]
-        llm_test_methods = [method for method in dir(TestLLMAPIErrors) if method.startswith('test_')]
-        parsing_test_methods = [method for method in dir(TestParsingFailures) if method.startswith('test_')]
+        # Check error scenario test cases; a parametrized method counts once per case
+        def count_cases(test_class):
+            total = 0
+            for name in dir(test_class):
+                if not name.startswith('test_'):
+                    continue
+                cases = 1
+                for mark in getattr(getattr(test_class, name), 'pytestmark', []):
+                    if mark.name == 'parametrize':
+                        cases *= len(mark.args[1])
+                total += cases
+            return total
         
-        total_error_tests = len(network_test_methods) + len(llm_test_methods) + len(parsing_test_methods)
+        total_error_tests = sum(
+            count_cases(test_class)
+            for test_class in (TestNetworkFailures, TestLLMAPIErrors, TestParsingFailures)
+        )
         assert total_error_tests >= 15, f"Insufficient error scenario tests: {total_error_tests}"
         
         print(f"✅ Requirement 4: Error scenario testing - {total_error_tests} error tests")
@@ -402,6 +402,7 @@ class TestTextExtractor:
         assert "6h" in result
 
 
+@pytest.mark.live
 def test_extract_text_from_google_flights_url():
     """
     Fetches the Google Flights page and prints the text extracted by TextExtractor.
@@ -420,6 +421,7 @@ def test_extract_text_from_google_flights_url():
     assert isinstance(extracted_text, str)
 
 
+@pytest.mark.live
 def test_fetch_raw_html_from_google_flights_url():
     """
     Fetches the Google Flights page and prints the RAW HTML (no noise reduction).
@@ -437,6 +439,7 @@ def test_fetch_raw_html_from_google_flights_url():
 
 import pytest
 
+@pytest.mark.live
 @pytest.mark.asyncio
 async def test_playwright_text_extractor_google_flights():
     """
@@ -452,6 +455,7 @@ async def test_playwright_text_extractor_google_flights():
     print("\n--- End of Playwright Extracted HTML ---\n")
     assert "example domain" in html.lower()
 
+@pytest.mark.live
 @pytest.mark.asyncio
 async def test_playwright_text_extractor_structured_data():
     """